@@ -472,6 +472,91 @@ df_gold.write.mode("overwrite").format("parquet").saveAsTable("gold_sleep_metric
 
 # COMMAND ----------
 
+# MAGIC %md
+# MAGIC **Camada de Relatório (Report)**
+# MAGIC
+# MAGIC Os gráficos e a tabela de resumo da seção 6 precisam apenas de alguns agregados pequenos. Em vez de recalculá-los a cada renderização (lendo a Silver inteira e convertendo para Pandas), materializamos uma camada **Report** com exatamente os datasets de cada visualização, já com os rótulos traduzidos e particionados por `locale`:
+# MAGIC
+# MAGIC - `report_sleep_disorder_counts`: número de indivíduos por distúrbio (gráfico de barras).
+# MAGIC - `report_sleep_quality_summary`: quantidade, média, mediana e desvio padrão da qualidade do sono por distúrbio (tabela de resumo).
+# MAGIC - `report_sleep_duration_vs_quality`: pares distintos de duração × qualidade por distúrbio, com a contagem de indivíduos (gráfico de dispersão, em que o tamanho do ponto representa a contagem).
+# MAGIC
+# MAGIC Essas tabelas têm poucas linhas e podem ser lidas diretamente em Parquet pelo exportador HTML, sem Spark e sem carga no cluster.
+
+# COMMAND ----------
+
+from pyspark.sql import functions as F
+
+# 🌐 Rótulos dos distúrbios por locale
+DISORDER_LABELS = {
+    "pt_BR": {"Sleep Apnea": "Apneia do Sono", "Insomnia": "Insônia", "None": "Ausência de Distúrbio do Sono"},
+    "en_US": {"Sleep Apnea": "Sleep Apnea", "Insomnia": "Insomnia", "None": "No Sleep Disorder"},
+}
+UNKNOWN_LABELS = {"pt_BR": "Desconhecido", "en_US": "Unknown"}
+
+REPORT_ROOT = "/FileStore/tables/report"
+
+df_locales = spark.createDataFrame(list(UNKNOWN_LABELS.items()), ["locale", "unknown_label"])
+df_labels = spark.createDataFrame(
+    [(locale, disorder, label)
+     for locale, labels in DISORDER_LABELS.items()
+     for disorder, label in labels.items()],
+    ["locale", "sleep_disorder", "disturbio_sono"]
+)
+
+# Replicar a Silver para cada locale e traduzir os distúrbios (desconhecidos recebem o rótulo padrão)
+df_silver = spark.table("silver_sleep_health")
+df_report_base = (
+    df_silver.select("sleep_duration", "sleep_quality", "sleep_disorder")
+    .crossJoin(df_locales)
+    .join(df_labels, on=["locale", "sleep_disorder"], how="left")
+    .withColumn("disturbio_sono", F.coalesce(F.col("disturbio_sono"), F.col("unknown_label")))
+    .drop("unknown_label")
+    .cache()  # reutilizada pelos três datasets abaixo
+)
+
+report_tables = {
+    "report_sleep_disorder_counts": (
+        df_report_base.groupBy("locale", "disturbio_sono")
+        .agg(F.count("*").alias("count"))
+    ),
+    "report_sleep_quality_summary": (
+        df_report_base.groupBy("locale", "disturbio_sono")
+        .agg(
+            F.count("*").alias("count_individuals"),
+            F.round(F.avg("sleep_quality"), 2).alias("avg_sleep_quality"),
+            F.round(F.expr("percentile(sleep_quality, 0.5)"), 2).alias("median_sleep_quality"),
+            F.round(F.stddev_samp("sleep_quality"), 2).alias("std_sleep_quality")
+        )
+    ),
+    "report_sleep_duration_vs_quality": (
+        df_report_base.groupBy("locale", "disturbio_sono", "sleep_duration", "sleep_quality")
+        .agg(F.count("*").alias("count_individuals"))
+    ),
+}
+
+# Persistir cada dataset uma única vez em Parquet (particionado por locale) e registrar
+# no catálogo uma tabela apontando para o mesmo diretório (exportador e SQL leem os mesmos arquivos)
+for table_name, df_report in report_tables.items():
+    spark.sql(f"DROP TABLE IF EXISTS {table_name}")
+    dbutils.fs.rm(f"dbfs:/user/hive/warehouse/{table_name}", recurse=True)
+
+    report_path = f"dbfs:{REPORT_ROOT}/{table_name}"
+    df_report.coalesce(1).write.mode("overwrite").partitionBy("locale").parquet(report_path)
+    spark.sql(f"CREATE TABLE {table_name} USING PARQUET LOCATION '{report_path}'")
+    spark.sql(f"MSCK REPAIR TABLE {table_name}")
+
+    print(f"{table_name}: {spark.table(table_name).count()} linhas")
+
+df_report_base.unpersist()
+
+# COMMAND ----------
+
+# MAGIC %sql
+# MAGIC SELECT * FROM report_sleep_quality_summary WHERE locale = 'pt_BR';
+
+# COMMAND ----------
+
 # MAGIC %md
 # MAGIC **Análise da Qualidade do Sono por Tipo de Distúrbio**
 # MAGIC
@@ -503,30 +588,19 @@ import seaborn as sns
 import pandas as pd
 from pyspark.sql import functions as F
 
-# Carregar e preparar os dados da tabela silver
-df_silver = spark.table("silver_sleep_health")
-
-# Traduzir distúrbios para português
-df_box = df_silver.select("sleep_quality", "sleep_disorder") \
-    .withColumn(
-        "Distúrbio do Sono",
-        F.when(F.col("sleep_disorder") == "Sleep Apnea", "Apneia do Sono")
-         .when(F.col("sleep_disorder") == "Insomnia", "Insônia")
-         .when(F.col("sleep_disorder") == "None", "Ausência de Distúrbio do Sono")
-         .otherwise("Desconhecido")
-    ).toPandas()
-
-# Agrupar e calcular estatísticas
+# Carregar as estatísticas já materializadas na camada Report (locale pt_BR)
 df_resumo = (
-    df_box.groupby("Distúrbio do Sono")["sleep_quality"]
-    .agg(["count", "mean", "median", "std"])
+    spark.table("report_sleep_quality_summary")
+    .filter(F.col("locale") == "pt_BR")
+    .drop("locale")
+    .toPandas()
+    .set_index("disturbio_sono")
     .rename(columns={
-        "count": "Qtd Indivíduos",
-        "mean": "Média",
-        "median": "Mediana",
-        "std": "Desvio Padrão"
+        "count_individuals": "Qtd Indivíduos",
+        "avg_sleep_quality": "Média",
+        "median_sleep_quality": "Mediana",
+        "std_sleep_quality": "Desvio Padrão"
     })
-    .round(2)
     .sort_values(by="Média", ascending=False)
 )
 
@@ -571,23 +645,14 @@ import seaborn as sns
 import pandas as pd
 from pyspark.sql import functions as F
 
-# Carregar a tabela Silver
-df_silver = spark.table("silver_sleep_health")
-
-# Traduzir os rótulos dos distúrbios (incluindo None)
-df_pt = df_silver.withColumn(
-    "disturbio_sono",
-    F.when(F.col("sleep_disorder") == "Sleep Apnea", "Apneia do Sono")
-     .when(F.col("sleep_disorder") == "Insomnia", "Insônia")
-     .when(F.col("sleep_disorder") == "None", "Ausência de Distúrbio do Sono")
-     .otherwise("Desconhecido")  # Segurança extra para casos inesperados
-)
-
-# Agrupar e converter para Pandas
+# Carregar as contagens já materializadas na camada Report (locale pt_BR)
 sleep_disorder_counts = (
-    df_pt.groupBy("disturbio_sono").count()
+    spark.table("report_sleep_disorder_counts")
+    .filter(F.col("locale") == "pt_BR")
+    .select("disturbio_sono", "count")
     .toPandas()
     .sort_values(by="count", ascending=False)
+    .reset_index(drop=True)
 )
 
 # Plotar gráfico
@@ -645,18 +710,13 @@ import seaborn as sns
 import pandas as pd
 from pyspark.sql import functions as F
 
-# Carregar a tabela Silver
-df_silver = spark.table("silver_sleep_health")
-
-# Traduzir os rótulos dos distúrbios (inclusive None)
-df_plot = df_silver.select("sleep_duration", "sleep_quality", "sleep_disorder") \
-    .withColumn(
-        "disturbio_sono",
-        F.when(F.col("sleep_disorder") == "Sleep Apnea", "Apneia do Sono")
-         .when(F.col("sleep_disorder") == "Insomnia", "Insônia")
-         .when(F.col("sleep_disorder") == "None", "Ausência de Distúrbio do Sono")
-         .otherwise("Desconhecido")
-    ).toPandas()
+# Carregar os pares duração × qualidade já materializados na camada Report (locale pt_BR)
+df_plot = (
+    spark.table("report_sleep_duration_vs_quality")
+    .filter(F.col("locale") == "pt_BR")
+    .select("sleep_duration", "sleep_quality", "disturbio_sono", "count_individuals")
+    .toPandas()
+)
 
 # Gráfico de dispersão
 plt.figure(figsize=(10, 6))
@@ -666,9 +726,10 @@ sns.scatterplot(data=df_plot,
                 x="sleep_duration",
                 y="sleep_quality",
                 hue="disturbio_sono",
+                size="count_individuals",  # pontos repetidos ficam maiores
+                sizes=(40, 240),
                 palette="Set1",
-                alpha=0.8,
-                s=60)
+                alpha=0.8)
 
 plt.title("Relação entre Duração e Qualidade do Sono por Tipo de Distúrbio", fontsize=14, weight='bold')
 plt.xlabel("Duração do Sono (horas)", fontsize=12)
@@ -726,4 +787,324 @@ plt.show()
 # MAGIC
 # MAGIC Conclusão do Estudo: Construímos um pipeline completo de dados, passando pelas camadas Bronze (ingestão bruta), Silver (refinamento e limpeza) e Gold (agregação e sumarização), usando Spark no ambiente Databricks. O dataset Sleep Health and Lifestyle nos permitiu explorar como fatores de estilo de vida e saúde se relacionam com a qualidade do sono. Confirmamos expectativas, como o impacto negativo do estresse e de distúrbios como insônia, e levantamos insights acionáveis, como a identificação de grupos (por profissão ou gênero) que poderiam se beneficiar de atenção especial para melhoria do sono. Todos os passos foram documentados em detalhe, mostrando não apenas o o que foi feito, mas por que – desde decisões de modelagem até interpretação de resultados._
 # MAGIC
-# MAGIC Aprendizados e Boas Práticas Aplicadas: Conseguimos aplicar com sucesso boas práticas de engenharia de dados, como a organização em camadas, o uso de formatos colunar eficientes (Parquet), a criação de um catálogo de dados, e transformações com APIs distribuídas do Spark ao invés de abordagens sequenciais. A separação em Bronze/Silver/Gold demonstrou como cada camada tem um propósito distinto (confiabilidade vs. usabilidade vs. valor de negócio). Além disso, integraremos no futuro a automação desses passos em um fluxo de trabalho repetível (por exemplo, usando jobs do Databricks ou pipelines de integração contínua de dados).
\ No newline at end of file
+# MAGIC Aprendizados e Boas Práticas Aplicadas: Conseguimos aplicar com sucesso boas práticas de engenharia de dados, como a organização em camadas, o uso de formatos colunar eficientes (Parquet), a criação de um catálogo de dados, e transformações com APIs distribuídas do Spark ao invés de abordagens sequenciais. A separação em Bronze/Silver/Gold demonstrou como cada camada tem um propósito distinto (confiabilidade vs. usabilidade vs. valor de negócio). Além disso, integraremos no futuro a automação desses passos em um fluxo de trabalho repetível (por exemplo, usando jobs do Databricks ou pipelines de integração contínua de dados).
+
+# COMMAND ----------
+
+# MAGIC %md
+# MAGIC 8. **Exportação do Relatório em HTML**
+# MAGIC
+# MAGIC O relatório final (tabela de resumo, gráfico de barras e gráfico de dispersão) é gerado diretamente a partir da camada **Report**. O exportador abaixo usa apenas Pandas e Matplotlib/Seaborn para ler os Parquet particionados por `locale` pelo caminho `/dbfs`, sem iniciar nenhum job Spark. Assim, o HTML pode ser regenerado em milissegundos e compartilhado com vários usuários sem carga no cluster.
+# MAGIC
+# MAGIC O exportador fica no módulo `sono_report.py` e também pode ser executado fora do Databricks pela linha de comando, bastando uma cópia da pasta `report`. O resultado (`sono_report_<locale>.html`) é um relatório separado com as três visualizações, e não a exportação HTML deste notebook.
+
+# COMMAND ----------
+
+# O exportador fica no módulo sono_report.py, ao lado deste notebook, e também pode ser
+# executado fora do Databricks: python sono_report.py <pasta report> <saida.html> --locale pt_BR
+from sono_report import REPORT_TEXT, export_report_html
+
+# Gerar um relatório por locale a partir da cópia local (FUSE) da camada Report
+for locale in REPORT_TEXT:
+    path = export_report_html("/dbfs" + REPORT_ROOT, f"/dbfs/FileStore/reports/sono_report_{locale}.html", locale)
+    print(f"Relatório gerado: {path}")
+
+# COMMAND ----------
+
+# MAGIC %md
+# MAGIC 9. **Motor Local (single-node) com Leitura em Blocos**
+# MAGIC
+# MAGIC Fora do Spark, a alternativa natural seria carregar o CSV inteiro no Pandas, o que deixa de funcionar quando os arquivos de origem ficam maiores que a memória disponível. Para o caminho single-node, implementamos um leitor **Bronze em streaming**:
+# MAGIC
+# MAGIC - O CSV (no layout de `Sleep_health_and_lifestyle_dataset.csv`) é lido em blocos de tamanho fixo (`CHUNK_ROWS` linhas), com tipos fixos para que todos os blocos tenham o mesmo schema.
+# MAGIC - Cada bloco recebe a mesma limpeza da camada Silver: renomeação para snake_case, remoção de espaços, `Normal Weight` → `Normal` e separação da pressão arterial em `bp_systolic` e `bp_diastolic`.
+# MAGIC - Cada bloco limpo é gravado como um **row group** no Parquet da Silver, de forma incremental.
+# MAGIC - As métricas da Gold são mantidas como agregados parciais (contagens e somas por distúrbio) em um estado acumulado, e as médias só são calculadas ao final.
+# MAGIC
+# MAGIC Assim, o pico de memória depende apenas do tamanho do bloco, e não do tamanho do arquivo.
+
+# COMMAND ----------
+
+import os
+
+import pandas as pd
+
+# O motor local fica no módulo sono_local_engine.py, ao lado deste notebook: os workers
+# da ingestão paralela (seção 10) precisam importá-lo em processos novos
+from sono_local_engine import run_local_silver
+
+# COMMAND ----------
+
+# Executar o motor local sobre o mesmo CSV da camada Bronze (acesso via /dbfs)
+LOCAL_ROOT = "/dbfs/FileStore/tables/local"
+
+# Blocos pequenos (50 linhas) para que o CSV de 374 linhas passe por vários blocos
+# e o estado acumulado da Gold seja de fato combinado entre eles
+gold_state = run_local_silver(
+    "/dbfs/FileStore/tables/Sleep_health_and_lifestyle_dataset.csv",
+    f"{LOCAL_ROOT}/silver/sleep_health_and_lifestyle.parquet",
+    chunk_rows=50,
+)
+
+df_gold_local = gold_state.to_frame()
+os.makedirs(f"{LOCAL_ROOT}/gold", exist_ok=True)
+df_gold_local.to_parquet(f"{LOCAL_ROOT}/gold/sleep_metrics_by_disorder.parquet", index=False)
+
+# Validar contra a tabela gold_sleep_metrics_by_disorder gerada pelo Spark
+integer_columns = {"count_individuals": "int64", "avg_daily_steps": "int64"}
+df_gold_spark = spark.table("gold_sleep_metrics_by_disorder").toPandas()
+pd.testing.assert_frame_equal(
+    df_gold_local.sort_values("sleep_disorder").reset_index(drop=True).astype(integer_columns),
+    df_gold_spark[df_gold_local.columns].sort_values("sleep_disorder").reset_index(drop=True).astype(integer_columns),
+    check_dtype=False,
+)
+
+df_gold_local
+
+# COMMAND ----------
+
+# MAGIC %md
+# MAGIC 10. **Ingestão Paralela de Múltiplos Arquivos**
+# MAGIC
+# MAGIC Quando vários CSVs chegam ao mesmo tempo, o motor local processaria um arquivo após o outro. Para aproveitar todos os núcleos da máquina, a etapa Bronze/Silver é distribuída em um **pool de processos** (um worker por núcleo):
+# MAGIC
+# MAGIC - Cada worker lê, limpa e grava sua **própria parte Parquet** da Silver usando o leitor em blocos da seção anterior, e devolve sua Gold parcial (contagens e somas).
+# MAGIC - O coordenador combina as Golds parciais, grava a tabela Gold e, por último, grava um único **manifesto** (`_manifest.json`) com as partes, linhas e arquivos de origem da execução.
+# MAGIC
+# MAGIC Cada execução grava suas partes e sua Gold em diretórios próprios (`silver/run=<run_id>/` e `gold/run=<run_id>/`), que nenhuma outra execução reutiliza. O manifesto é o ponto de commit: ele é escrito em um arquivo temporário e renomeado atomicamente só depois que todos os arquivos da execução existem, e só então são removidos os diretórios da execução que o manifesto substituído publicava (execuções em andamento nunca são apagadas). Qualquer falha antes do commit remove os diretórios da própria execução. Assim, o manifesto publicado sempre aponta para uma execução completa. Um leitor que ainda esteja lendo a execução anterior no momento da limpeza recebe um erro e deve repetir a leitura a partir do novo manifesto. Se duas ingestões se sobrepuserem, a que publicar primeiro pode ficar órfã no disco (nunca referenciada), mas nenhuma apaga os arquivos da outra.
+# MAGIC
+# MAGIC Os workers são iniciados com `spawn` (processos novos que importam `sono_local_engine.py`), e não com `fork`: o processo driver do Databricks tem várias threads (conexão py4j com o Spark, servidor HTTP da seção 11), e fazer `fork` de um processo com threads pode travar. Como os workers não compartilham estado, a vazão cresce de forma praticamente linear com o número de núcleos.
+
+# COMMAND ----------
+
+import glob
+import shutil
+
+# O coordenador fica em sono_local_engine.py junto com os workers: além de o pool usar "spawn",
+# lá `sum` e `round` são os built-ins do Python (neste notebook foram substituídos pelos do PySpark)
+from sono_local_engine import run_parallel_ingestion
+
+# COMMAND ----------
+
+LANDING_DIR = "/dbfs/FileStore/tables/landing"
+
+# Sem novos arquivos na pasta de entrada, usar o mesmo CSV da camada Bronze
+os.makedirs(LANDING_DIR, exist_ok=True)
+if not glob.glob(f"{LANDING_DIR}/*.csv"):
+    shutil.copy("/dbfs/FileStore/tables/Sleep_health_and_lifestyle_dataset.csv", LANDING_DIR)
+
+# Ingerir todos os CSVs que chegaram na pasta de entrada
+manifest = run_parallel_ingestion(
+    glob.glob(f"{LANDING_DIR}/*.csv"),
+    "/dbfs/FileStore/tables/local_parallel",
+)
+
+print(f"{len(manifest['silver_parts'])} arquivos, {manifest['total_rows']} registros, "
+      f"{manifest['workers']} workers, {manifest['elapsed_seconds']} s")
+
+# COMMAND ----------
+
+# MAGIC %md
+# MAGIC 11. **API de Consulta da Gold com Cache**
+# MAGIC
+# MAGIC Hoje os consumidores consultam `gold_sleep_metrics_by_disorder` diretamente via Spark SQL, e cada requisição inicia um novo job no cluster. Para os dashboards, expomos uma pequena API de leitura, `get_metrics(group_by=..., filters=...)`, sobre as mesmas tabelas Gold:
+# MAGIC
+# MAGIC - Os arquivos Parquet da tabela registrada no catálogo (`/dbfs/user/hive/warehouse/gold_sleep_metrics_by_disorder`) são lidos diretamente com PyArrow, sem job Spark. Cada valor de `group_by` corresponde a uma tabela Gold (`GOLD_TABLES`); hoje existe apenas `sleep_disorder`, e os filtros só podem usar a coluna de agrupamento.
+# MAGIC - Os resultados ficam em um **cache LRU com TTL** em memória, já serializados em JSON; consultas repetidas são respondidas em menos de um milissegundo, sem ida ao cluster.
+# MAGIC - A versão de cada tabela é derivada da listagem dos seus arquivos: toda regravação pelo Spark cria arquivos com novos nomes. A listagem é refeita no máximo uma vez a cada `poll_seconds` (o acesso a `/dbfs` é uma chamada remota), e quando a versão muda o cache é invalidado. Cada resposta informa a versão a partir da qual foi calculada.
+# MAGIC - Erros de leitura (tabela ausente, arquivos substituídos durante uma regravação) são devolvidos pelo endpoint como HTTP 503, para que o dashboard tente novamente.
+# MAGIC - Um endpoint HTTP local (`GET /metrics`) permite que os dashboards usem a API, por exemplo: `/metrics?group_by=sleep_disorder&sleep_disorder=Insomnia&sleep_disorder=None`.
+
+# COMMAND ----------
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# Tabelas Gold servidas pela API, pela coluna de agrupamento (diretório da tabela gerenciada no DBFS)
+GOLD_TABLES = {
+    "sleep_disorder": "/dbfs/user/hive/warehouse/gold_sleep_metrics_by_disorder",
+}
+
+
+class TTLCache:
+    """Cache LRU em memória com expiração por tempo (TTL), seguro entre threads."""
+
+    def __init__(self, max_entries=256, ttl_seconds=300):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False, None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return False, None
+            self._entries.move_to_end(key)
+            return True, value
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+def table_version(table_dir):
+    """Versão de uma tabela Parquet derivada da listagem dos seus arquivos (nomes e tamanhos)."""
+    entries = sorted((entry.name, entry.stat().st_size) for entry in os.scandir(table_dir) if entry.is_file())
+    return hashlib.sha1(repr(entries).encode("utf-8")).hexdigest()[:16]
+
+
+class GoldMetricsService:
+    """API de leitura das tabelas Gold com cache, invalidado quando uma nova versão é publicada."""
+
+    def __init__(self, tables=GOLD_TABLES, cache=None, poll_seconds=5.0):
+        self.tables = tables
+        self.cache = cache or TTLCache()
+        self.poll_seconds = poll_seconds
+        self._versions = {}
+        self._checked_at = {}
+        self._lock = threading.Lock()
+
+    def current_version(self, group_by):
+        """Versão da tabela Gold; a listagem no DBFS é refeita no máximo a cada `poll_seconds`."""
+        with self._lock:
+            now = time.monotonic()
+            if now - self._checked_at.get(group_by, float("-inf")) >= self.poll_seconds:
+                version = table_version(self.tables[group_by])
+                if self._versions.get(group_by) not in (None, version):
+                    self.cache.clear()
+                self._versions[group_by] = version
+                self._checked_at[group_by] = now
+            return self._versions[group_by]
+
+    def get_metrics_json(self, group_by="sleep_disorder", filters=None):
+        """Resposta serializada (bytes JSON) de `get_metrics`; é o valor guardado no cache."""
+        group_by = [group_by] if isinstance(group_by, str) else list(dict.fromkeys(group_by))
+        if len(group_by) != 1 or group_by[0] not in self.tables:
+            raise ValueError(f"group_by inválido: {group_by}; use uma de {sorted(self.tables)}")
+        group_by = group_by[0]
+
+        filters = {
+            column: list(values) if isinstance(values, (list, tuple, set)) else [values]
+            for column, values in (filters or {}).items()
+        }
+        unknown = [column for column in filters if column != group_by]
+        if unknown:
+            raise ValueError(f"Filtros inválidos: {unknown}; a tabela Gold só pode ser filtrada por {group_by}")
+        values = tuple(sorted({str(value) for value in filters.get(group_by, [])}))
+
+        version = self.current_version(group_by)
+        key = (group_by, version, values)
+        hit, payload = self.cache.get(key)
+        if not hit:
+            payload = self._read_gold(group_by, version, values)
+            self.cache.put(key, payload)
+        return payload
+
+    def get_metrics(self, group_by="sleep_disorder", filters=None):
+        """Métricas da Gold por `group_by`, restritas por `filters` ({coluna: valor(es)}).
+
+        Devolve `{"version": ..., "metrics": [...]}`, uma cópia nova a cada chamada.
+        """
+        return json.loads(self.get_metrics_json(group_by, filters))
+
+    def _read_gold(self, group_by, version, values):
+        # O PyArrow ignora os marcadores do Spark (_SUCCESS, _committed_*, ...) ao ler o diretório
+        filters = [(group_by, "in", list(values))] if values else None
+        df_gold = pq.read_table(self.tables[group_by], filters=filters).to_pandas()
+        metrics = json.loads(df_gold.sort_values(group_by).to_json(orient="records"))
+        return json.dumps({"version": version, "metrics": metrics}, ensure_ascii=False).encode("utf-8")
+
+
+def make_metrics_handler(service):
+    """Cria o handler HTTP que expõe `GET /metrics` para o serviço informado."""
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            url = urlparse(self.path)
+            if url.path != "/metrics":
+                self._send_json(404, {"error": "Recurso não encontrado"})
+                return
+
+            # Filtros podem ser repetidos: ?group_by=sleep_disorder&sleep_disorder=Insomnia&sleep_disorder=None
+            params = parse_qs(url.query)
+            group_by = params.pop("group_by", ["sleep_disorder"])
+            try:
+                payload = service.get_metrics_json(group_by=group_by, filters=params)
+            except (OSError, pa.ArrowException) as e:
+                # Tabela ainda não publicada ou arquivos substituídos durante a leitura
+                self._send_json(503, {"error": f"Gold indisponível no momento: {e}"})
+                return
+            except ValueError as e:
+                self._send_json(400, {"error": str(e)})
+                return
+            except Exception as e:
+                self._send_json(500, {"error": f"Erro interno: {e}"})
+                return
+            self._send_body(200, payload)
+
+        def _send_json(self, status, payload):
+            self._send_body(status, json.dumps(payload, ensure_ascii=False).encode("utf-8"))
+
+        def _send_body(self, status, body):
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            # Evita poluir a saída do notebook a cada requisição
+            pass
+
+    return MetricsHandler
+
+
+def start_metrics_server(service, host="127.0.0.1", port=8765):
+    """Inicia o endpoint HTTP local em uma thread de background e devolve o servidor."""
+    server = ThreadingHTTPServer((host, port), make_metrics_handler(service))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+# COMMAND ----------
+
+# Consultar as métricas da tabela gold_sleep_metrics_by_disorder
+metrics_service = GoldMetricsService()
+
+started = time.perf_counter()
+metrics_service.get_metrics_json(group_by="sleep_disorder")
+print(f"Primeira consulta: {(time.perf_counter() - started) * 1000:.2f} ms")
+
+started = time.perf_counter()
+metrics_service.get_metrics_json(group_by="sleep_disorder")
+print(f"Consulta repetida (cache): {(time.perf_counter() - started) * 1000:.3f} ms")
+
+result = metrics_service.get_metrics(group_by="sleep_disorder")
+print(f"Versão: {result['version']}")
+
+pd.DataFrame(result["metrics"])
+
+# COMMAND ----------
+
+# Expor a API para os dashboards (http://127.0.0.1:8765/metrics?group_by=sleep_disorder)
+metrics_server = start_metrics_server(metrics_service)
+print(f"Endpoint disponível em http://{metrics_server.server_address[0]}:{metrics_server.server_address[1]}/metrics")
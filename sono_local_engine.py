@@ -0,0 +1,294 @@
+"""Motor local (single-node) do pipeline de sono.
+
+Leitura do CSV Bronze em blocos de tamanho fixo, limpeza Silver por bloco,
+gravação incremental em Parquet e agregados parciais da Gold, além do
+coordenador da ingestão paralela. Fica em um módulo importável (e não em uma
+célula do notebook) para que os workers da ingestão paralela possam ser
+iniciados com ``spawn``.
+"""
+
+import json
+import multiprocessing
+import os
+import shutil
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from decimal import Decimal, ROUND_HALF_UP
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# Número de linhas por bloco (define o pico de memória do motor local)
+CHUNK_ROWS = 50_000
+
+# Tipos fixos das colunas Bronze (evita inferência diferente entre blocos)
+BRONZE_DTYPES = {
+    "Person ID": "Int64",
+    "Gender": "string",
+    "Age": "Int64",
+    "Occupation": "string",
+    "Sleep Duration": "float64",
+    "Quality of Sleep": "Int64",
+    "Physical Activity Level": "Int64",
+    "Stress Level": "Int64",
+    "BMI Category": "string",
+    "Blood Pressure": "string",
+    "Heart Rate": "Int64",
+    "Daily Steps": "Int64",
+    "Sleep Disorder": "string",
+}
+
+# Mesma renomeação snake_case aplicada na camada Silver do Spark
+SILVER_COLUMN_NAMES = {
+    "Person ID": "person_id",
+    "Gender": "gender",
+    "Age": "age",
+    "Occupation": "occupation",
+    "Sleep Duration": "sleep_duration",
+    "Quality of Sleep": "sleep_quality",
+    "Physical Activity Level": "physical_activity_level",
+    "Stress Level": "stress_level",
+    "BMI Category": "bmi_category",
+    "Blood Pressure": "blood_pressure",
+    "Heart Rate": "heart_rate",
+    "Daily Steps": "daily_steps",
+    "Sleep Disorder": "sleep_disorder",
+}
+
+SILVER_TEXT_COLUMNS = ["gender", "occupation", "bmi_category", "sleep_disorder"]
+
+SILVER_SCHEMA = pa.schema([
+    ("person_id", pa.int64()),
+    ("gender", pa.string()),
+    ("age", pa.int64()),
+    ("occupation", pa.string()),
+    ("sleep_duration", pa.float64()),
+    ("sleep_quality", pa.int64()),
+    ("physical_activity_level", pa.int64()),
+    ("stress_level", pa.int64()),
+    ("bmi_category", pa.string()),
+    ("blood_pressure", pa.string()),
+    ("heart_rate", pa.int64()),
+    ("daily_steps", pa.int64()),
+    ("sleep_disorder", pa.string()),
+    ("bp_systolic", pa.int32()),
+    ("bp_diastolic", pa.int32()),
+])
+
+# Colunas com média na tabela gold_sleep_metrics_by_disorder
+GOLD_AVG_COLUMNS = [
+    "sleep_duration", "sleep_quality", "stress_level",
+    "physical_activity_level", "heart_rate", "daily_steps",
+]
+GOLD_COLUMNS = ["sleep_disorder", "count_individuals"] + [f"avg_{c}" for c in GOLD_AVG_COLUMNS]
+
+
+def read_bronze_chunks(csv_path, chunk_rows=CHUNK_ROWS):
+    """Lê o CSV Bronze em blocos de `chunk_rows` linhas, sem carregar o arquivo inteiro."""
+    # Apenas campos vazios viram nulos: "None" é uma categoria válida de sleep_disorder
+    return pd.read_csv(csv_path, dtype=BRONZE_DTYPES, chunksize=chunk_rows,
+                       keep_default_na=False, na_values=[""])
+
+
+def clean_silver_chunk(df_chunk):
+    """Aplica a limpeza da camada Silver a um bloco Bronze."""
+    df_chunk = df_chunk.rename(columns=SILVER_COLUMN_NAMES)
+
+    for column in SILVER_TEXT_COLUMNS:
+        df_chunk[column] = df_chunk[column].str.strip()
+
+    df_chunk["bmi_category"] = df_chunk["bmi_category"].replace("Normal Weight", "Normal")
+
+    blood_pressure = df_chunk["blood_pressure"].str.split("/")
+    df_chunk["bp_systolic"] = pd.to_numeric(blood_pressure.str[0], errors="coerce").astype("Int32")
+    df_chunk["bp_diastolic"] = pd.to_numeric(blood_pressure.str[1], errors="coerce").astype("Int32")
+    return df_chunk
+
+
+def round_half_up(value, digits):
+    """Arredonda como o `round` do Spark (HALF_UP), e não como o arredondamento bancário do Python."""
+    if pd.isna(value):
+        return None
+    return float(Decimal(str(value)).quantize(Decimal(1).scaleb(-digits), rounding=ROUND_HALF_UP))
+
+
+class GoldAccumulator:
+    """Agregados parciais da Gold (contagens e somas por distúrbio), atualizados bloco a bloco."""
+
+    def __init__(self):
+        self.counts = {}
+        self.sums = {}
+        self.non_null = {}
+
+    def update(self, df_chunk):
+        grouped = df_chunk.groupby("sleep_disorder", dropna=False)
+        chunk_counts = grouped.size()
+        chunk_sums = grouped[GOLD_AVG_COLUMNS].sum()
+        chunk_non_null = grouped[GOLD_AVG_COLUMNS].count()
+
+        # Os três resultados vêm do mesmo groupby, portanto as linhas estão alinhadas
+        for disorder, count_individuals, (_, sums), (_, non_null) in zip(
+                chunk_counts.index, chunk_counts, chunk_sums.iterrows(), chunk_non_null.iterrows()):
+            self._add(
+                None if pd.isna(disorder) else disorder,
+                int(count_individuals),
+                {c: float(sums[c]) for c in GOLD_AVG_COLUMNS},
+                {c: int(non_null[c]) for c in GOLD_AVG_COLUMNS},
+            )
+        return self
+
+    def merge(self, other):
+        for disorder, count_individuals in other.counts.items():
+            self._add(disorder, count_individuals, other.sums[disorder], other.non_null[disorder])
+        return self
+
+    def _add(self, disorder, count_individuals, sums, non_null):
+        self.counts[disorder] = self.counts.get(disorder, 0) + count_individuals
+        previous_sums = self.sums.get(disorder, dict.fromkeys(GOLD_AVG_COLUMNS, 0.0))
+        previous_non_null = self.non_null.get(disorder, dict.fromkeys(GOLD_AVG_COLUMNS, 0))
+        self.sums[disorder] = {c: previous_sums[c] + sums[c] for c in GOLD_AVG_COLUMNS}
+        self.non_null[disorder] = {c: previous_non_null[c] + non_null[c] for c in GOLD_AVG_COLUMNS}
+
+    def to_frame(self):
+        """Calcula as médias finais no mesmo formato de gold_sleep_metrics_by_disorder."""
+        rows = []
+        for disorder, count_individuals in self.counts.items():
+            averages = {
+                c: (self.sums[disorder][c] / self.non_null[disorder][c]) if self.non_null[disorder][c] else None
+                for c in GOLD_AVG_COLUMNS
+            }
+            avg_daily_steps = round_half_up(averages["daily_steps"], 0)
+            rows.append({
+                "sleep_disorder": disorder,
+                "count_individuals": count_individuals,
+                "avg_sleep_duration": round_half_up(averages["sleep_duration"], 2),
+                "avg_sleep_quality": round_half_up(averages["sleep_quality"], 2),
+                "avg_stress_level": round_half_up(averages["stress_level"], 2),
+                "avg_physical_activity_level": round_half_up(averages["physical_activity_level"], 2),
+                "avg_heart_rate": round_half_up(averages["heart_rate"], 2),
+                "avg_daily_steps": None if avg_daily_steps is None else int(avg_daily_steps),
+            })
+        df_gold = pd.DataFrame(rows, columns=GOLD_COLUMNS)
+        df_gold["avg_daily_steps"] = df_gold["avg_daily_steps"].astype("Int64")
+        return df_gold
+
+
+def run_local_silver(csv_path, silver_path, chunk_rows=CHUNK_ROWS):
+    """Converte o CSV Bronze em Parquet Silver bloco a bloco e devolve o estado parcial da Gold."""
+    gold = GoldAccumulator()
+    if os.path.dirname(silver_path):
+        os.makedirs(os.path.dirname(silver_path), exist_ok=True)
+
+    with pq.ParquetWriter(silver_path, SILVER_SCHEMA) as writer:
+        for df_chunk in read_bronze_chunks(csv_path, chunk_rows):
+            df_chunk = clean_silver_chunk(df_chunk)
+            # Cada bloco vira um row group: nada além do bloco atual fica em memória
+            writer.write_table(pa.Table.from_pandas(df_chunk, schema=SILVER_SCHEMA, preserve_index=False))
+            gold.update(df_chunk)
+
+    return gold
+
+
+def ingest_file(csv_path, part_path, chunk_rows=CHUNK_ROWS):
+    """Worker: converte um CSV em sua parte Parquet da Silver e devolve a Gold parcial."""
+    gold = run_local_silver(csv_path, part_path, chunk_rows)
+    return {
+        "source": csv_path,
+        "part_path": part_path,
+        "rows": pq.ParquetFile(part_path).metadata.num_rows,
+        "gold": gold,
+    }
+
+
+def read_manifest(manifest_path):
+    """Lê o manifesto publicado, ou devolve None se ainda não houver nenhum."""
+    try:
+        with open(manifest_path, encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def write_manifest(manifest_path, manifest):
+    """Grava o manifesto de forma atômica (arquivo temporário + rename)."""
+    tmp_path = f"{manifest_path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, manifest_path)
+
+
+def remove_runs(output_root, manifest):
+    """Remove os diretórios de execução referenciados por um manifesto substituído."""
+    run_dirs = {os.path.dirname(part["path"]) for part in manifest["silver_parts"]}
+    run_dirs.add(os.path.dirname(manifest["gold"]))
+    for run_dir in run_dirs:
+        shutil.rmtree(os.path.join(output_root, run_dir), ignore_errors=True)
+
+
+def run_parallel_ingestion(csv_paths, output_root, max_workers=None, chunk_rows=CHUNK_ROWS):
+    """Distribui os CSVs em um pool de processos e consolida Silver, Gold e manifesto."""
+    csv_paths = sorted(csv_paths)
+    if not csv_paths:
+        raise ValueError("Nenhum arquivo CSV informado para ingestão")
+
+    created_at = datetime.now(timezone.utc)
+    run_id = f"{created_at:%Y%m%dT%H%M%S%fZ}-{uuid.uuid4().hex[:8]}"
+    max_workers = min(max_workers or os.cpu_count() or 1, len(csv_paths))
+    silver_dir = os.path.join("silver", f"run={run_id}")
+    gold_dir = os.path.join("gold", f"run={run_id}")
+    manifest_path = os.path.join(output_root, "_manifest.json")
+
+    # Um nome de parte por arquivo (o índice evita colisões entre arquivos de mesmo nome)
+    part_paths = [
+        os.path.join(silver_dir, f"part-{i:05d}-{os.path.splitext(os.path.basename(path))[0]}.parquet")
+        for i, path in enumerate(csv_paths)
+    ]
+    gold_path = os.path.join(gold_dir, "sleep_metrics_by_disorder.parquet")
+
+    try:
+        os.makedirs(os.path.join(output_root, silver_dir))
+        os.makedirs(os.path.join(output_root, gold_dir))
+
+        started = time.perf_counter()
+        # "spawn": fazer fork do driver (com threads do py4j e do servidor HTTP) pode travar
+        with ProcessPoolExecutor(max_workers=max_workers,
+                                 mp_context=multiprocessing.get_context("spawn")) as executor:
+            results = list(executor.map(ingest_file, csv_paths,
+                                        [os.path.join(output_root, path) for path in part_paths],
+                                        [chunk_rows] * len(csv_paths)))
+        elapsed = time.perf_counter() - started
+
+        # Coordenador: combinar as Golds parciais e gravar a tabela Gold da execução
+        gold = GoldAccumulator()
+        for result in results:
+            gold.merge(result["gold"])
+        gold.to_frame().to_parquet(os.path.join(output_root, gold_path), index=False)
+
+        manifest = {
+            "run_id": run_id,
+            "created_at": created_at.isoformat(),
+            "workers": max_workers,
+            "elapsed_seconds": round(elapsed, 3),
+            "total_rows": sum(result["rows"] for result in results),
+            "silver_parts": [
+                {"source": result["source"], "path": path, "rows": result["rows"]}
+                for result, path in zip(results, part_paths)
+            ],
+            "gold": gold_path,
+        }
+        previous_manifest = read_manifest(manifest_path)
+        # Commit: o novo manifesto substitui o anterior de forma atômica
+        write_manifest(manifest_path, manifest)
+    except BaseException:
+        # Execução não publicada: basta descartar seus arquivos
+        shutil.rmtree(os.path.join(output_root, silver_dir), ignore_errors=True)
+        shutil.rmtree(os.path.join(output_root, gold_dir), ignore_errors=True)
+        raise
+
+    # Só a execução que o manifesto anterior publicava é removida; execuções em andamento ficam intactas
+    if previous_manifest is not None:
+        remove_runs(output_root, previous_manifest)
+    return manifest
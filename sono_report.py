@@ -0,0 +1,142 @@
+"""Exportador HTML do relatório de sono a partir da camada Report.
+
+Lê os datasets pré-agregados (Parquet particionado por ``locale``) com Pandas e
+renderiza a tabela de resumo, o gráfico de barras e o gráfico de dispersão em um
+HTML autocontido, sem Spark. Pode ser usado pelo notebook ou pela linha de
+comando, fora do Databricks, a partir de uma cópia da pasta ``report``::
+
+    python sono_report.py /caminho/para/report relatorio.html --locale en_US
+"""
+
+import argparse
+import base64
+import io
+import os
+
+import matplotlib.pyplot as plt
+import pandas as pd
+import seaborn as sns
+
+# Textos do relatório por locale
+REPORT_TEXT = {
+    "pt_BR": {
+        "title": "Análise da Qualidade do Sono",
+        "summary_caption": "Resumo Estatístico da Qualidade do Sono por Distúrbio",
+        "summary_columns": {
+            "disturbio_sono": "Distúrbio do Sono",
+            "count_individuals": "Qtd Indivíduos",
+            "avg_sleep_quality": "Média",
+            "median_sleep_quality": "Mediana",
+            "std_sleep_quality": "Desvio Padrão",
+        },
+        "counts_title": "Distribuição dos Distúrbios do Sono",
+        "counts_xlabel": "Tipo de Distúrbio do Sono",
+        "counts_ylabel": "Número de Indivíduos",
+        "scatter_title": "Relação entre Duração e Qualidade do Sono por Tipo de Distúrbio",
+        "scatter_xlabel": "Duração do Sono (horas)",
+        "scatter_ylabel": "Qualidade do Sono (1 a 10)",
+    },
+    "en_US": {
+        "title": "Sleep Quality Analysis",
+        "summary_caption": "Sleep Quality Summary Statistics by Disorder",
+        "summary_columns": {
+            "disturbio_sono": "Sleep Disorder",
+            "count_individuals": "Individuals",
+            "avg_sleep_quality": "Mean",
+            "median_sleep_quality": "Median",
+            "std_sleep_quality": "Standard Deviation",
+        },
+        "counts_title": "Sleep Disorder Distribution",
+        "counts_xlabel": "Sleep Disorder Type",
+        "counts_ylabel": "Number of Individuals",
+        "scatter_title": "Sleep Duration vs. Sleep Quality by Disorder Type",
+        "scatter_xlabel": "Sleep Duration (hours)",
+        "scatter_ylabel": "Sleep Quality (1 to 10)",
+    },
+}
+
+
+def read_report_table(report_root, table_name, locale):
+    """Lê um dataset da camada Report lendo apenas a partição do locale (sem Spark)."""
+    df = pd.read_parquet(os.path.join(report_root, table_name), filters=[("locale", "==", locale)])
+    return df.drop(columns="locale")
+
+
+def figure_to_html(fig):
+    """Converte uma figura Matplotlib em uma tag <img> com o PNG embutido em base64."""
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="png", bbox_inches="tight")
+    plt.close(fig)
+    encoded = base64.b64encode(buffer.getvalue()).decode("ascii")
+    return f'<img src="data:image/png;base64,{encoded}"/>'
+
+
+def export_report_html(report_root, output_path, locale="pt_BR"):
+    """Renderiza o relatório HTML de um locale a partir das tabelas da camada Report."""
+    text = REPORT_TEXT[locale]
+    sns.set(style="whitegrid")
+
+    # Tabela de resumo
+    df_resumo = (
+        read_report_table(report_root, "report_sleep_quality_summary", locale)
+        .sort_values(by="avg_sleep_quality", ascending=False)
+        .rename(columns=text["summary_columns"])
+    )
+    summary_html = df_resumo.to_html(index=False, float_format="{:.2f}".format)
+
+    # Gráfico de barras
+    sleep_disorder_counts = (
+        read_report_table(report_root, "report_sleep_disorder_counts", locale)
+        .sort_values(by="count", ascending=False)
+        .reset_index(drop=True)
+    )
+    fig, ax = plt.subplots(figsize=(10, 6))
+    sns.barplot(x="disturbio_sono", y="count", data=sleep_disorder_counts, palette="Set2", ax=ax)
+    for i, row in sleep_disorder_counts.iterrows():
+        ax.text(i, row["count"] + 2, f"{row['count']}", ha="center", va="bottom", fontsize=11)
+    ax.set_title(text["counts_title"], fontsize=14, weight="bold")
+    ax.set_xlabel(text["counts_xlabel"], fontsize=12)
+    ax.set_ylabel(text["counts_ylabel"], fontsize=12)
+    ax.tick_params(axis="x", labelrotation=10)
+    counts_html = figure_to_html(fig)
+
+    # Gráfico de dispersão
+    df_plot = read_report_table(report_root, "report_sleep_duration_vs_quality", locale)
+    fig, ax = plt.subplots(figsize=(10, 6))
+    sns.scatterplot(data=df_plot, x="sleep_duration", y="sleep_quality", hue="disturbio_sono",
+                    size="count_individuals", sizes=(40, 240), palette="Set1", alpha=0.8, ax=ax)
+    ax.set_title(text["scatter_title"], fontsize=14, weight="bold")
+    ax.set_xlabel(text["scatter_xlabel"], fontsize=12)
+    ax.set_ylabel(text["scatter_ylabel"], fontsize=12)
+    ax.legend(title=text["summary_columns"]["disturbio_sono"], fontsize=10, title_fontsize=11)
+    ax.grid(True, linestyle="--", alpha=0.5)
+    scatter_html = figure_to_html(fig)
+
+    html = (
+        f'<!DOCTYPE html>\n<html lang="{locale.replace("_", "-")}">\n<head>\n<meta charset="utf-8"/>\n'
+        f"<title>{text['title']}</title>\n</head>\n<body>\n"
+        f"<h1>{text['title']}</h1>\n"
+        f"<h2>{text['summary_caption']}</h2>\n{summary_html}\n"
+        f"<h2>{text['counts_title']}</h2>\n{counts_html}\n"
+        f"<h2>{text['scatter_title']}</h2>\n{scatter_html}\n"
+        "</body>\n</html>\n"
+    )
+
+    if os.path.dirname(output_path):
+        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    with open(output_path, "w", encoding="utf-8") as f:
+        f.write(html)
+    return output_path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Gera o relatório HTML a partir da camada Report.")
+    parser.add_argument("report_root", help="Diretório com as tabelas report_* em Parquet")
+    parser.add_argument("output_path", help="Arquivo HTML de saída")
+    parser.add_argument("--locale", default="pt_BR", choices=sorted(REPORT_TEXT))
+    args = parser.parse_args(argv)
+    print(f"Relatório gerado: {export_report_html(args.report_root, args.output_path, args.locale)}")
+
+
+if __name__ == "__main__":
+    main()